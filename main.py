@@ -1,29 +1,362 @@
 import argparse
+import copy
+import functools
+import importlib.util
 import logging
 import re
 import json
+import os
+import random
 import sys
-from faker import Faker
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Possessive quantifiers and atomic groups never backtrack; they only exist in Python 3.11+
+_POSSESSIVE_REPEAT = getattr(sre_parse, "POSSESSIVE_REPEAT", None)
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+
+try:
+    import re2  # Optional: google-re2 guarantees linear-time matching
+except ImportError:
+    re2 = None
+
+try:
+    import pcre2  # Optional: PCRE2 JIT-compiles patterns to native code
+except ImportError:
+    pcre2 = None
+
+try:
+    import hyperscan  # Optional: Hyperscan matches all patterns in one vectorized pass
+except ImportError:
+    hyperscan = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Size in bytes of the chunks read when streaming input
+CHUNK_SIZE = 1 << 20
+
+# Buffer size of the output file
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Longest PII match expected, in bytes; matches longer than this may be split across streamed chunks.
+# A match straddling a split is carried over whole, unless it is longer than the chunk size
+MAX_MATCH_LENGTH = 256
+
+# Texts at least this large are matched with the default-pattern scanner; below this size,
+# importing and running Numba costs more than the regex engine takes
+SCANNER_MIN_SIZE = 64 << 10
+
+# Number of fake values generated per entity type before they are reused
+REPLACEMENT_POOL_SIZE = 1024
+
+# Cheap necessary conditions for the default patterns: text without any of them cannot contain a match
+_DEFAULT_PREFILTERS = {
+    "name": re.compile(rb"[a-z] [A-Z]"),
+    "address": re.compile(rb" St"),
+    "phone_number": re.compile(rb"\d{4}"),
+}
+
+# Matches the global inline flag groups at the start of a pattern, e.g. "(?i)" or "(?i)(?m)"
+_GLOBAL_FLAGS_RE = re.compile(r"(?:\(\?[aiLmsux]+\))+")
+
+# Matches the parts of a pattern that refer to groups. Escapes and character classes are matched whole
+# so their contents are skipped; an escape of three octal digits such as "\123" is a character, not a backreference.
+_GROUP_REFERENCE_RE = re.compile(
+    r"\\(?:[0-7]{3}|0[0-7]{0,2}|([1-9][0-9]?)|.)"  # escape, possibly a numbered backreference
+    r"|\[\^?\]?(?:\\.|[^\]])*\]"  # character class
+    r"|\(\?P<(\w+)>"  # named group
+    r"|\(\?P=(\w+)\)"  # named backreference
+    r"|\(\?\((\w+)\)",  # conditional group
+    re.S,
+)
+
+# Matches the parts of a pattern that RE2 or PCRE2 read differently from Python's re: escapes (RE2's "\s"
+# omits the vertical tab), character classes (which may also hold "\s" or a POSIX class such as "[:alpha:]")
+# and "{,n}", which RE2 takes literally
+_PORTABILITY_RE = re.compile(r"\\(?:[0-7]{3}|.)|\[\^?\]?(?:\\.|[^\]])*\]|\{,([0-9]*)\}", re.S)
+
+# Classes matching any character outside a set, including non-ASCII ones
+_NEGATED_CATEGORIES = (sre_parse.CATEGORY_NOT_DIGIT, sre_parse.CATEGORY_NOT_SPACE, sre_parse.CATEGORY_NOT_WORD)
+
+# ASCII characters matched by the class escapes, used to compare the first characters of alternatives
+_CATEGORY_CHARS = {
+    sre_parse.CATEGORY_DIGIT: frozenset(b"0123456789"),
+    sre_parse.CATEGORY_SPACE: frozenset(b" \t\n\r\f\v\x1c\x1d\x1e\x1f"),
+    sre_parse.CATEGORY_WORD: frozenset(b"0123456789_ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"),
+}
+
+# Python's "\s" for str patterns on ASCII text, spelled out so that bytes patterns and the other engines,
+# which leave out the separators \x1c-\x1f, match ASCII text as the str patterns would
+_SPACE_CHARS = r"\t\n\x0b\x0c\r\x1c-\x20"
+
+# Entity types of the default patterns, in the order the scanner tries them
+_DEFAULT_ENTITY_TYPES = ("name", "address", "phone_number")
+
+# SWAR masks of the default scanner: low bits, high bits, then the (hi, lo) bounds of digits,
+# uppercase letters and "(", each repeated in all 8 bytes of a word
+_SWAR_ONES = 0x0101010101010101
+_SWAR_MASKS = (
+    _SWAR_ONES * 127, _SWAR_ONES * 128,
+    _SWAR_ONES * (127 + 0x3A), _SWAR_ONES * (127 - 0x2F),
+    _SWAR_ONES * (127 + 0x5B), _SWAR_ONES * (127 - 0x40),
+    _SWAR_ONES * (127 + 0x29), _SWAR_ONES * (127 - 0x27),
+)
+
+def _scan_default_entities(data, words, masks):
+    """
+    Scans UTF-8 encoded text for the default patterns with a hand-written state machine.
+
+    The scanner follows the combined regex exactly on ASCII text: at each position it tries name, address and
+    phone number in that order, and resumes after the end of each match.
+
+    Between matches, whole 8-byte words are skipped with a SWAR test (SIMD within a register)
+    when none of their bytes can start a match, i.e. is a digit, an uppercase letter or "(".
+    For each byte x below 0x80, ``(_SWAR_ONES * (127 + hi) - (x & 127)) & ~x & ((x & 127) + _SWAR_ONES * (127 - lo))``
+    sets the byte's high bit exactly when lo < x < hi; bytes from 0x80 are excluded by ``~x``.
+
+    Args:
+        data (bytes): The UTF-8 encoded text.
+        words: The complete 8-byte words of ``data`` as unsigned 64-bit integers.
+        masks: _SWAR_MASKS, as unsigned 64-bit integers of the same type as ``words``.
+
+    Returns:
+        list: A list of (start, end, kind) tuples, where kind indexes _DEFAULT_ENTITY_TYPES.
+    """
+    n = len(data)
+    spans = []
+    i = 0
+    low_bits, high_bits = masks[0], masks[1]
+    digit_hi, digit_lo = masks[2], masks[3]
+    upper_hi, upper_lo = masks[4], masks[5]
+    paren_hi, paren_lo = masks[6], masks[7]
+    word_count = len(words)
+    while i < n:
+        c = data[i]
+        end = -1
+        kind = -1
+        if 65 <= c <= 90:
+            # name: [A-Z][a-z]+ [A-Z][a-z]+
+            j = i + 1
+            while j < n and 97 <= data[j] <= 122:
+                j += 1
+            if j > i + 1 and j + 1 < n and data[j] == 32 and 65 <= data[j + 1] <= 90:
+                k = j + 2
+                while k < n and 97 <= data[k] <= 122:
+                    k += 1
+                if k > j + 2:
+                    end = k
+                    kind = 0
+        elif 48 <= c <= 57 or c == 40:
+            if c != 40:
+                # address: \d+ [A-Za-z]+ St(?:reet)?
+                j = i + 1
+                while j < n and 48 <= data[j] <= 57:
+                    j += 1
+                if j < n and data[j] == 32:
+                    k = j + 1
+                    while k < n and (65 <= data[k] <= 90 or 97 <= data[k] <= 122):
+                        k += 1
+                    if k > j + 1 and k + 2 < n and data[k] == 32 and data[k + 1] == 83 and data[k + 2] == 116:
+                        end = k + 3
+                        if end + 3 < n and data[end] == 114 and data[end + 1] == 101 and data[end + 2] == 101 and data[end + 3] == 116:
+                            end += 4
+                        kind = 1
+            if end < 0:
+                # phone_number: \(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}
+                j = i + 1 if c == 40 else i
+                digits = 0
+                group = 0
+                while j < n and group < 3:
+                    d = data[j]
+                    if 48 <= d <= 57:
+                        digits += 1
+                        j += 1
+                        if digits == (4 if group == 2 else 3):
+                            group += 1
+                            digits = 0
+                            if group == 1 and j < n and data[j] == 41:
+                                j += 1
+                            if group < 3 and j < n and data[j] in (45, 46, 32, 9, 10, 11, 12, 13, 28, 29, 30, 31):
+                                j += 1
+                    else:
+                        break
+                if group == 3:
+                    end = j
+                    kind = 2
+        if end >= 0:
+            spans.append((i, end, kind))
+            i = end
+        else:
+            i += 1
+            if i & 7 == 0:
+                while (i >> 3) < word_count:
+                    x = words[i >> 3]
+                    t = x & low_bits
+                    candidates = (digit_hi - t) & (t + digit_lo)
+                    candidates |= (upper_hi - t) & (t + upper_lo)
+                    candidates |= (paren_hi - t) & (t + paren_lo)
+                    if candidates & ~x & high_bits != 0:
+                        break
+                    i += 8
+    return spans
+
+@functools.lru_cache(maxsize=None)
+def _native_default_scanner():
+    """
+    Compiles _scan_default_entities to native code with Numba (optional).
+
+    Numba is imported on first use rather than at startup, since importing it is slow.
+
+    Returns:
+        callable: A function scanning bytes like _scan_default_entities, or None if Numba is not available.
+    """
+    try:
+        import numba
+        import numpy
+    except ImportError:
+        return None
+    scanner = numba.njit(cache=True)(_scan_default_entities)
+    # Unsigned, since signed overflow in the SWAR arithmetic is undefined in compiled code
+    masks = numpy.array(_SWAR_MASKS, numpy.uint64)
+
+    def scan(data):
+        array = numpy.frombuffer(data, numpy.uint8)
+        return scanner(array, array[:len(array) & ~7].view(numpy.uint64), masks)
+    return scan
+
+# Sample data used by the built-in fake data generator
+_FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Lisa", "Daniel", "Nancy", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Dorothy", "George", "Melissa", "Timothy", "Deborah",
+    "Ronald", "Stephanie", "Edward", "Rebecca", "Jason", "Sharon", "Jeffrey", "Laura", "Ryan", "Cynthia",
+    "Jacob", "Kathleen", "Gary", "Amy", "Nicholas", "Angela", "Eric", "Shirley", "Jonathan", "Anna",
+    "Stephen", "Brenda", "Larry", "Pamela", "Justin", "Emma", "Scott", "Nicole", "Brandon", "Helen",
+    "Benjamin", "Samantha", "Samuel", "Katherine", "Gregory", "Christine", "Alexander", "Debra", "Frank", "Rachel",
+    "Patrick", "Carolyn", "Raymond", "Janet", "Jack", "Catherine", "Dennis", "Maria", "Jerry", "Heather",
+    "Tyler", "Diane", "Aaron", "Ruth", "Jose", "Julie", "Adam", "Olivia", "Nathan", "Joyce",
+    "Henry", "Virginia", "Douglas", "Victoria", "Zachary", "Kelly", "Peter", "Lauren", "Kyle", "Christina",
+    "Ethan", "Joan", "Walter", "Evelyn", "Noah", "Judith", "Jeremy", "Megan", "Christian", "Andrea",
+    "Keith", "Cheryl", "Roger", "Hannah", "Terry", "Jacqueline", "Gerald", "Martha", "Harold", "Gloria",
+    "Sean", "Teresa", "Austin", "Ann", "Carl", "Sara", "Arthur", "Madison", "Lawrence", "Frances",
+)
+_LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "Gomez", "Phillips", "Evans", "Turner", "Diaz", "Parker", "Cruz", "Edwards", "Collins", "Reyes",
+    "Stewart", "Morris", "Morales", "Murphy", "Cook", "Rogers", "Gutierrez", "Ortiz", "Morgan", "Cooper",
+    "Peterson", "Bailey", "Reed", "Kelly", "Howard", "Ramos", "Kim", "Cox", "Ward", "Richardson",
+    "Watson", "Brooks", "Chavez", "Wood", "James", "Bennett", "Gray", "Mendoza", "Ruiz", "Hughes",
+    "Price", "Alvarez", "Castillo", "Sanders", "Patel", "Myers", "Long", "Ross", "Foster", "Jimenez",
+    "Powell", "Jenkins", "Perry", "Russell", "Sullivan", "Bell", "Coleman", "Butler", "Henderson", "Barnes",
+    "Gonzales", "Fisher", "Vasquez", "Simmons", "Romero", "Jordan", "Patterson", "Alexander", "Hamilton", "Graham",
+    "Reynolds", "Griffin", "Wallace", "Moreno", "West", "Cole", "Hayes", "Bryant", "Herrera", "Gibson",
+    "Ellis", "Tran", "Medina", "Aguilar", "Stevens", "Murray", "Ford", "Castro", "Marshall", "Owens",
+    "Harrison", "Fernandez", "McDonald", "Woods", "Washington", "Kennedy", "Wells", "Vargas", "Henry", "Chen",
+)
+_STREET_NAMES = (
+    "Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Washington", "Lake", "Hill", "Walnut",
+    "Spring", "North", "Park", "Ridge", "Church", "Willow", "Mill", "Sunset", "Railroad", "Jackson",
+    "Cherry", "Highland", "Jefferson", "Lincoln", "Madison", "Franklin", "Center", "River", "Forest", "Meadow",
+    "Chestnut", "Spruce", "Dogwood", "Hickory", "Birch", "Valley", "Prospect", "Woodland", "Adams", "Lakeview",
+    "Sycamore", "Magnolia", "Laurel", "Hillcrest", "Broad", "Market", "Union", "Bridge", "Front", "College",
+)
+_STREET_SUFFIXES = (
+    "Street", "Avenue", "Road", "Lane", "Drive", "Court", "Place", "Boulevard", "Way", "Terrace",
+    "Circle", "Trail", "Parkway", "Square", "Crossing", "Ridge", "Hollow", "Run", "Path", "Loop",
+)
+_CITIES = (
+    "Springfield", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem", "Madison", "Georgetown", "Arlington",
+    "Ashland", "Dover", "Oxford", "Jackson", "Burlington", "Manchester", "Milton", "Newport", "Auburn", "Dayton",
+    "Lexington", "Milford", "Riverside", "Cleveland", "Hudson", "Kingston", "Mount Vernon", "Winchester", "Centerville", "Lebanon",
+    "Marion", "Chester", "Florence", "Hamilton", "Union", "Troy", "Plymouth", "Shelby", "Monroe", "Lancaster",
+)
+_STATE_ABBREVIATIONS = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+)
+_PHONE_FORMATS = ("{}-{}-{}", "({}) {}-{}", "({}){}-{}", "{}.{}.{}")
+
+class _BuiltinFaker:
+    """
+    A lightweight stand-in for Faker generating names, addresses and phone numbers from bundled sample data.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Initializes the generator.
+
+        Args:
+            seed (int, optional): Seed for reproducible fake data. Defaults to None.
+        """
+        self._random = random.Random(seed)
+
+    def name(self):
+        """Returns a fake full name."""
+        return f"{self._random.choice(_FIRST_NAMES)} {self._random.choice(_LAST_NAMES)}"
+
+    def address(self):
+        """Returns a fake two-line US postal address."""
+        rng = self._random
+        street = f"{rng.randint(1, 9999)} {rng.choice(_STREET_NAMES)} {rng.choice(_STREET_SUFFIXES)}"
+        return f"{street}\n{rng.choice(_CITIES)}, {rng.choice(_STATE_ABBREVIATIONS)} {rng.randint(10000, 99999)}"
+
+    def phone_number(self):
+        """Returns a fake US phone number."""
+        rng = self._random
+        return rng.choice(_PHONE_FORMATS).format(rng.randint(201, 989), rng.randint(200, 999), f"{rng.randint(0, 9999):04d}")
+
 class PIIEntityRedactor:
     """
     A class for identifying and redacting Personally Identifiable Information (PII) entities in text.
     """
 
-    def __init__(self, patterns=None, faker_instance=None):
+    def __init__(self, patterns=None, faker_instance=None, consistent=False, pool_size=REPLACEMENT_POOL_SIZE, use_scanner=None, seed=None):
         """
         Initializes the PIIEntityRedactor with optional custom patterns and a Faker instance.
 
         Args:
             patterns (dict, optional): A dictionary of regex patterns for PII entities. Defaults to None.
-            faker_instance (Faker, optional): An instance of the Faker library for generating fake data. Defaults to None.
+            faker_instance (Faker, optional): An instance of the Faker library for generating fake data. Defaults to None,
+                which uses a lightweight built-in generator.
+            consistent (bool, optional): Whether repeated mentions of the same entity get the same replacement. Defaults to False.
+            pool_size (int, optional): The number of fake values generated per entity type before they are reused. Defaults to REPLACEMENT_POOL_SIZE.
+            use_scanner (bool, optional): Whether to match the default patterns in texts of at least SCANNER_MIN_SIZE bytes with the hand-written scanner instead of a regex engine. Defaults to None, which uses it only when Numba is installed.
+            seed (int, optional): Seed for the built-in generator, for reproducible replacements. Defaults to None.
         """
         self.patterns = patterns or self._default_patterns()  # Use custom patterns or default if none provided
-        self.faker = faker_instance or Faker() #Use provided or default faker
+        self.faker = faker_instance or _BuiltinFaker(seed) #Use provided or built-in fake data generator
+        self.seed = seed
+        self._generators = self._bind_generators() # Bound once here rather than looked up on every replacement
         self.logger = logging.getLogger(__name__)
+        self.consistent = consistent
+        self.pool_size = pool_size
+        self._replacement_pools = {} # Fake values generated so far, per entity type
+        self._draw_counts = {} # Number of replacements drawn so far, per entity type
+        self._consistent_replacements = {} # (entity type, original text) -> replacement
+        self._combined_pattern, self._text_pattern, self._group_entities = self._compile_patterns(self.patterns)
+        uses_default_patterns = list(self.patterns.items()) == list(self._default_patterns().items())
+        if use_scanner is None:
+            # Only look Numba up here; it is imported when the scanner first runs
+            use_scanner = uses_default_patterns and importlib.util.find_spec("numba") is not None
+        self._use_default_scanner = use_scanner and uses_default_patterns
+        # Large texts go to the scanner, so Hyperscan would only ever see small ones
+        self._hyperscan_db = self._compile_hyperscan(self.patterns) if not self._use_default_scanner else None
+        # Confirms Hyperscan hits; re has the lowest overhead per search call
+        self._hyperscan_confirmer = re.compile(self._combined_pattern.pattern) if self._hyperscan_db is not None else None
+        self._prefilters = self._build_prefilters(self.patterns)
 
     def _default_patterns(self):
         """
@@ -38,51 +371,725 @@ class PIIEntityRedactor:
             "phone_number": r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}" # Simple phone regex
         }
 
+    def _compile_patterns(self, patterns):
+        """
+        Combines all regex patterns into a single alternation of named groups so the text is scanned once.
+
+        Each pattern is wrapped as ``(?P<tag>(?:pattern))``; the number of the matching tag group
+        (``match.lastindex``, since the tag group closes last) identifies the entity type. The combination is
+        compiled as a str pattern matching decoded text (text mode), which gives classes such as ``\\d`` and ``\\s``
+        their Unicode meaning. If every pattern only matches ASCII characters, it is also compiled as a bytes pattern
+        matching UTF-8 encoded text directly, which is used for ASCII text, where both read alike. A pattern that
+        can match other characters (a non-ASCII literal, ``.``, a negated class) could split a multi-byte character.
+
+        Args:
+            patterns (dict): A dictionary mapping entity types to regex patterns.
+
+        Returns:
+            tuple: The compiled bytes pattern, or None if some pattern can match non-ASCII characters,
+            the compiled str pattern, and a dictionary mapping tag group numbers to entity types.
+
+        Raises:
+            re.error: If any of the patterns is invalid.
+        """
+        compiled_patterns = []
+        for entity_type, pattern in patterns.items():
+            try:
+                compiled_patterns.append(re.compile(pattern))
+            except re.error as e:
+                self.logger.error(f"Regex error in pattern for {entity_type}: {e}")
+                raise
+        ascii_only = all(self._matches_ascii_only(pattern) for pattern in patterns.values())
+
+        group_entities = {}
+        text_alternatives = []
+        alternatives = []
+        group_count = 0
+        excluded_engines = set()
+        for index, ((entity_type, pattern), compiled) in enumerate(zip(patterns.items(), compiled_patterns)):
+            tag = f"_pii{index}"
+            group_entities[group_count + 1] = entity_type
+            # Numbered groups shift by the tag groups and the groups of earlier patterns
+            shifted = self._shift_group_references(pattern, group_count + 1, compiled.groupindex)
+            text_alternatives.append(f"(?P<{tag}>{self._scope_inline_flags(shifted)})")
+            if ascii_only:
+                pattern, incompatible = self._make_portable(pattern)
+                excluded_engines |= incompatible
+                shifted = self._shift_group_references(pattern, group_count + 1, compiled.groupindex)
+                alternatives.append(f"(?P<{tag}>{self._scope_inline_flags(shifted)})")
+            group_count += compiled.groups + 1
+        text_pattern = re.compile("|".join(text_alternatives))
+        if not ascii_only:
+            return None, text_pattern, group_entities
+        expression = "|".join(alternatives).encode()
+        return self._compile_combined(expression, excluded_engines), text_pattern, group_entities
+
+    def _matches_ascii_only(self, pattern):
+        """
+        Checks whether a pattern can be matched against UTF-8 bytes, i.e. whether it is valid as a bytes
+        pattern and every character it can match is ASCII, so a match never splits a multi-byte character.
+
+        Args:
+            pattern (str): The regex pattern.
+
+        Returns:
+            bool: True if the pattern only matches ASCII characters.
+        """
+        try:
+            re.compile(pattern.encode())
+        except (re.error, UnicodeEncodeError):
+            return False
+        for op, av in _iter_nodes(sre_parse.parse(pattern)):
+            if op in (sre_parse.ANY, sre_parse.NOT_LITERAL) or (op == sre_parse.LITERAL and av >= 0x80):
+                return False
+            if op == sre_parse.IN:
+                for item_op, item_av in av:
+                    if item_op == sre_parse.NEGATE or (item_op == sre_parse.LITERAL and item_av >= 0x80):
+                        return False
+                    if item_op == sre_parse.RANGE and item_av[1] >= 0x80:
+                        return False
+                    if item_op == sre_parse.CATEGORY and item_av in _NEGATED_CATEGORIES:
+                        return False
+        return True
+
+    def _compile_combined(self, expression, excluded_engines=frozenset()):
+        """
+        Compiles the combined expression with the fastest available engine.
+
+        RE2 is preferred since it matches in time linear in the input length, but it rejects features
+        such as backreferences and lookaround. Patterns using them are JIT-compiled with PCRE2 when
+        available, and compiled with Python's re module otherwise.
+
+        Args:
+            expression (bytes): The combined regex expression.
+            excluded_engines (set, optional): Names of the engines ("re2", "pcre2") that would read the expression differently
+                from Python's re. Defaults to an empty set.
+
+        Returns:
+            The compiled pattern (re2, pcre2 or re), all exposing the same matching API.
+        """
+        if re2 is not None and "re2" not in excluded_engines:
+            options = re2.Options()
+            options.log_errors = False
+            options.encoding = re2.Options.Encoding.LATIN1 # Match single bytes like re, not UTF-8 characters
+            try:
+                return re2.compile(expression, options)
+            except re2.error as e:
+                self.logger.debug(f"RE2 rejected the patterns ({e}); falling back.")
+        if pcre2 is not None and "pcre2" not in excluded_engines:
+            try:
+                return pcre2.compile(expression, jit=True)
+            except pcre2.error as e:
+                self.logger.debug(f"PCRE2 rejected the patterns ({e}); falling back to re.")
+        return re.compile(expression)
+
+    def _make_portable(self, pattern):
+        """
+        Rewrites a pattern so that the other regex engines read it like Python's re, where possible.
+
+        ``{,n}`` becomes ``{0,n}`` and ``\\s`` is spelled out as a class. Constructs that cannot be rewritten
+        exclude the engines that read them differently: ``$``, which RE2 does not match before a final newline,
+        ``\\Z``, which PCRE2 does, POSIX classes such as ``[[:alpha:]]``, ``\\S`` inside a class, and patterns
+        matching the empty string, after which RE2 resumes the scan differently.
+
+        Args:
+            pattern (str): The regex pattern.
+
+        Returns:
+            tuple: The rewritten pattern and the set of engine names that must not compile it.
+        """
+        incompatible = set()
+
+        def rewrite_class_escape(match):
+            if match.group(0) == r"\s":
+                return _SPACE_CHARS
+            if match.group(0) == r"\S":
+                incompatible.add("re2")
+            return match.group(0)
+
+        def rewrite(match):
+            token = match.group(0)
+            if match.group(1) is not None:
+                return f"{{0,{match.group(1)}}}"
+            if token == r"\s":
+                return f"[{_SPACE_CHARS}]"
+            if token == r"\S":
+                return f"[^{_SPACE_CHARS}]"
+            if token.startswith("["):
+                if "[:" in token:
+                    incompatible.update(("re2", "pcre2"))
+                return re.sub(r"\\(?:[0-7]{3}|.)", rewrite_class_escape, token, flags=re.S)
+            return token
+
+        pattern = _PORTABILITY_RE.sub(rewrite, pattern)
+        tree = sre_parse.parse(pattern)
+        nodes = list(_iter_nodes(tree))
+        if _is_nullable(tree) or (sre_parse.AT, sre_parse.AT_END) in nodes:
+            incompatible.add("re2")
+        if (sre_parse.AT, sre_parse.AT_END_STRING) in nodes:
+            incompatible.add("pcre2")
+        return pattern, incompatible
+
+    def _shift_group_references(self, pattern, offset, group_index):
+        """
+        Renumbers group references (e.g. ``\\1``) in a pattern embedded in the combined expression.
+
+        Named groups become plain numbered groups, since the same name may be used by several patterns,
+        and references to them (``(?P=name)``, ``(?(name)...)``) are turned into numbered ones.
+
+        Args:
+            pattern (str): The regex pattern.
+            offset (int): The number of groups preceding the pattern's own groups.
+            group_index (dict): The pattern's own mapping of group names to group numbers.
+
+        Returns:
+            str: The pattern with its group references shifted by ``offset``.
+        """
+        def shift(match):
+            number, name, reference, condition = match.groups()
+            if number is not None:
+                return f"(?:\\{int(number) + offset})"
+            if name is not None:
+                return "("
+            if reference in group_index:
+                return f"(?:\\{group_index[reference] + offset})"
+            if condition is not None:
+                target = int(condition) if condition.isdigit() else group_index.get(condition)
+                if target is not None:
+                    return f"(?({target + offset})"
+            return match.group(0)
+        return _GROUP_REFERENCE_RE.sub(shift, pattern)
+
+    def _scope_inline_flags(self, pattern):
+        """
+        Turns leading global inline flags (e.g. ``(?i)`` or ``(?i)(?m)``) into a single scoped group, since
+        global flags are only allowed at the start of the combined expression. In verbose mode the group is closed
+        on a new line, so that a trailing ``# comment`` does not swallow the closing parenthesis.
+
+        Args:
+            pattern (str): The regex pattern.
+
+        Returns:
+            str: A non-capturing group equivalent to the pattern.
+        """
+        match = _GLOBAL_FLAGS_RE.match(pattern)
+        if match:
+            flags = "".join(dict.fromkeys(re.sub(r"[(?)]", "", match.group())))
+            closing = "\n)" if "x" in flags else ")"
+            return f"(?{flags}:{pattern[match.end():]}{closing}"
+        return f"(?:{pattern})"
+
+    def _compile_hyperscan(self, patterns):
+        """
+        Compiles all patterns into a single Hyperscan database when Hyperscan is available.
+
+        Hyperscan reads some syntax such as ``{,n}`` differently from re, so hits for custom patterns could
+        miss matches. The database is therefore only built for the default patterns, which both read alike;
+        custom patterns use the regex engine.
+
+        Args:
+            patterns (dict): A dictionary mapping entity types to regex patterns.
+
+        Returns:
+            hyperscan.Database: The compiled database, or None if Hyperscan is unavailable or not used for these patterns.
+        """
+        if hyperscan is None:
+            return None
+        default_patterns = self._default_patterns()
+        if any(default_patterns.get(entity_type) != pattern for entity_type, pattern in patterns.items()):
+            return None
+        flags = hyperscan.HS_FLAG_SOM_LEFTMOST
+        db = hyperscan.Database()
+        try:
+            db.compile(
+                expressions=[self._make_portable(pattern)[0].encode() for pattern in patterns.values()],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[flags] * len(patterns),
+            )
+        except hyperscan.error as e:
+            self.logger.debug(f"Hyperscan rejected the patterns ({e}); using the regex engine.")
+            return None
+        return db
+
+    def _build_prefilters(self, patterns):
+        """
+        Collects the prefilters for the configured patterns.
+
+        Prefilters are only known for the default patterns; a custom pattern disables prefiltering.
+
+        Args:
+            patterns (dict): A dictionary mapping entity types to regex patterns.
+
+        Returns:
+            list: The compiled prefilters, or None if the text must always be scanned.
+        """
+        default_patterns = self._default_patterns()
+        prefilters = []
+        for entity_type, pattern in patterns.items():
+            if entity_type not in _DEFAULT_PREFILTERS or pattern != default_patterns[entity_type]:
+                return None
+            prefilters.append(_DEFAULT_PREFILTERS[entity_type])
+        return prefilters
+
+    def _may_contain_pii(self, data):
+        """
+        Checks the prefilters to rule out texts that cannot contain any match.
+        The prefilters are bytes patterns, so they only apply to ASCII text.
+
+        Args:
+            data (bytes): The UTF-8 encoded text to check.
+
+        Returns:
+            bool: False if no pattern can match the text, True otherwise.
+        """
+        if self._prefilters is None or not data.isascii():
+            return True
+        return any(prefilter.search(data) for prefilter in self._prefilters)
+
     def redact_text(self, text):
         """
         Redacts PII entities in the given text using the configured patterns.
 
+        Matching works on UTF-8 bytes: text given as str is encoded first and the result decoded.
+        Text with non-ASCII characters is matched decoded, so classes such as ``\\d`` and ``\\w`` keep their
+        Unicode meaning. Invalid UTF-8 in bytes input is passed through unchanged.
+
         Args:
-            text (str): The text to redact.
+            text (str or bytes): The text to redact.
 
         Returns:
-            str: The redacted text.
+            str or bytes: The redacted text, of the same type as ``text``.
+        """
+        if isinstance(text, str):
+            return self._redact(text.encode()).decode()
+        return self._redact(text)
+
+    def _redact(self, data):
+        """
+        Redacts PII entities in UTF-8 encoded text.
+
+        Args:
+            data (bytes): The UTF-8 encoded text to redact.
+
+        Returns:
+            bytes: The redacted text.
         """
-        redacted_text = text
         try:
-            for entity_type, pattern in self.patterns.items():
-                redacted_text = re.sub(pattern, self._get_replacement(entity_type), redacted_text)
-        except re.error as e:
-            self.logger.error(f"Regex error: {e}")
+            if not self._may_contain_pii(data):
+                return data
+            return self._replace_spans(data, self._iter_spans(data))
+        except Exception as e:
+            self.logger.exception("An unexpected error occurred during redaction.")
             raise
+
+    def _replace_spans(self, data, spans):
+        """
+        Replaces the given spans of UTF-8 encoded text with fake data.
+
+        Args:
+            data (bytes): The UTF-8 encoded text.
+            spans: An iterable of the (start, end, entity type) of each match, in order and without overlaps.
+
+        Returns:
+            bytes: The redacted text.
+        """
+        redacted = bytearray()
+        last_end = 0
+        for start, end, entity_type in spans:
+            redacted += data[last_end:start]
+            redacted += self._get_replacement(entity_type, data[start:end])
+            last_end = end
+        redacted += data[last_end:]
+        return bytes(redacted)
+
+    def redact_stream(self, reader, writer, chunk_size=CHUNK_SIZE, jobs=1):
+        """
+        Redacts PII entities in a binary stream of UTF-8 text chunk by chunk, keeping memory use bounded.
+
+        The last ``MAX_MATCH_LENGTH`` bytes of each chunk are carried over to the next one,
+        so matches spanning chunk boundaries are still redacted as a whole. Each buffer is scanned once:
+        the matches found before the split are replaced directly and only the carried tail is scanned again.
+
+        Args:
+            reader: A readable binary stream.
+            writer: A writable binary stream receiving the redacted text.
+            chunk_size (int, optional): The number of bytes read at a time. Defaults to CHUNK_SIZE.
+            jobs (int, optional): The number of worker processes redacting chunks in parallel. Defaults to 1.
+        """
+        chunks = self._iter_chunks(reader, chunk_size)
+        if jobs > 1:
+            self._redact_chunks_in_parallel((chunk for chunk, spans in chunks), writer, jobs)
+            return
+        try:
+            for chunk, spans in chunks:
+                writer.write(self._replace_spans(chunk, spans))
         except Exception as e:
             self.logger.exception("An unexpected error occurred during redaction.")
             raise
-        return redacted_text
 
-    def _get_replacement(self, entity_type):
+    def _iter_chunks(self, reader, chunk_size):
+        """
+        Reads a binary stream in chunks split where no match is cut through.
+
+        Args:
+            reader: A readable binary stream.
+            chunk_size (int): The number of bytes read at a time.
+
+        Yields:
+            tuple: The next chunk of text to redact and the (start, end, entity type) of each match in it.
+        """
+        buffer = b""
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+            cut, spans = self._split_buffer(buffer, chunk_size)
+            if cut > 0:
+                yield buffer[:cut], spans
+                buffer = buffer[cut:]
+        if buffer:
+            yield buffer, list(self._iter_spans(buffer)) if self._may_contain_pii(buffer) else []
+
+    def _redact_chunks_in_parallel(self, chunks, writer, jobs):
+        """
+        Redacts chunks in a pool of worker processes and writes the results in order.
+
+        Each worker builds its own redactor from this one's settings, so a custom fake data generator
+        is replaced by a default Faker instance and consistent mode only holds within a worker.
+        With a seed, each chunk is redacted from a state derived from the seed and the chunk's index,
+        so the output does not depend on which worker gets which chunk (consistent mode then only holds within a chunk).
+
+        Args:
+            chunks: An iterable of UTF-8 encoded text chunks.
+            writer: A writable binary stream receiving the redacted text.
+            jobs (int): The number of worker processes.
+        """
+        use_faker = not isinstance(self.faker, _BuiltinFaker)
+        settings = (self.patterns, self.consistent, self.pool_size, self._use_default_scanner, use_faker, self.seed)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=settings) as executor:
+            pending = deque()
+            for index, chunk in enumerate(chunks):
+                pending.append(executor.submit(_redact_in_worker, index, chunk))
+                if len(pending) >= 2 * jobs: # Bound the number of chunks held in memory
+                    writer.write(pending.popleft().result())
+            while pending:
+                writer.write(pending.popleft().result())
+
+    def _split_buffer(self, buffer, chunk_size):
+        """
+        Finds where a buffer can be split without cutting through a match, and the matches before the split.
+
+        The buffer is scanned from its start, as its first chunk will be when redacted, so the split
+        never falls inside a match the redaction would find. A straddling match longer than ``chunk_size``
+        is split anyway, and its first part scanned on its own, so the carried tail stays bounded.
+
+        Args:
+            buffer (bytes): The buffered text.
+            chunk_size (int): The number of bytes read at a time.
+
+        Returns:
+            tuple: The split position, ``MAX_MATCH_LENGTH`` bytes before the end of the buffer
+            or earlier if a match straddles that point, and the (start, end, entity type) of each match before it.
+        """
+        cut = len(buffer) - MAX_MATCH_LENGTH
+        while cut > 0 and buffer[cut] & 0xC0 == 0x80: # Never split a multi-byte character
+            cut -= 1
+        if cut <= 0:
+            return 0, []
+        if not self._may_contain_pii(buffer):
+            return cut, []
+        spans = []
+        for start, end, entity_type in self._iter_spans(buffer):
+            if start >= cut:
+                break
+            if end > cut:
+                if cut - start <= chunk_size:
+                    return start, spans
+                head = buffer[start:cut]
+                if self._may_contain_pii(head):
+                    spans.extend((start + head_start, start + head_end, head_type)
+                                 for head_start, head_end, head_type in self._iter_spans(head))
+                break
+            spans.append((start, end, entity_type))
+        return cut, spans
+
+    def _iter_spans(self, data):
+        """
+        Finds the PII entities in UTF-8 encoded text with the configured matcher.
+
+        Only ASCII text goes to the bytes matchers; other text is matched in text mode.
+
+        Args:
+            data (bytes): The UTF-8 encoded text to scan.
+
+        Returns:
+            iterable: The (start, end, entity type) of each match, in order and without overlaps.
+        """
+        if self._combined_pattern is None or not data.isascii():
+            return self._text_spans(data)
+        if self._use_default_scanner and len(data) >= SCANNER_MIN_SIZE:
+            return self._default_scanner_spans(data)
+        if self._hyperscan_db is not None:
+            return self._hyperscan_spans(data)
+        return ((match.start(), match.end(), self._group_entities[match.lastindex])
+                for match in self._combined_pattern.finditer(data))
+
+    def _text_spans(self, data):
+        """
+        Finds PII entities with the combined pattern in text mode, matching the decoded text.
+
+        Invalid UTF-8 is decoded with the surrogateescape error handler, so the byte offsets
+        of the matches can be recovered by encoding the text back.
+
+        Args:
+            data (bytes): The UTF-8 encoded text to scan.
+
+        Yields:
+            tuple: The (start, end, entity type) of each match, as byte offsets into ``data``.
+        """
+        text = data.decode("utf-8", "surrogateescape")
+        position = byte_position = 0
+        for match in self._text_pattern.finditer(text):
+            start = byte_position + len(text[position:match.start()].encode("utf-8", "surrogateescape"))
+            end = start + len(match.group().encode("utf-8", "surrogateescape"))
+            position, byte_position = match.end(), end
+            yield start, end, self._group_entities[match.lastindex]
+
+    def _default_scanner_spans(self, data):
+        """
+        Finds the default PII entities using the hand-written scanner,
+        natively compiled when Numba is available.
+
+        Args:
+            data (bytes): The UTF-8 encoded text to scan.
+
+        Returns:
+            list: The (start, end, entity type) of each match.
+        """
+        native_scanner = _native_default_scanner()
+        if native_scanner is not None:
+            spans = native_scanner(data)
+        else:
+            spans = _scan_default_entities(data, memoryview(data)[:len(data) & ~7].cast("Q"), _SWAR_MASKS)
+        return [(start, end, _DEFAULT_ENTITY_TYPES[kind]) for start, end, kind in spans]
+
+    def _hyperscan_spans(self, data):
+        """
+        Finds PII entities by scanning the text once with the Hyperscan database.
+
+        Hyperscan reports each match end with only its leftmost start, which is not always where the
+        combined regex would start the match after the previous one. Its hits are therefore only used to
+        skip text: the combined expression confirms each match, searching from the first hit ending past the
+        previous match. No match of the regex can start before that hit, since it would have a hit of its own.
+
+        Args:
+            data (bytes): The UTF-8 encoded text to scan.
+
+        Returns:
+            list: The (start, end, entity type) of each match.
+        """
+        hits = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            hits.append((start, end))
+
+        self._hyperscan_db.scan(data, match_event_handler=on_match)
+        hits.sort()
+
+        spans = []
+        last_end = 0
+        for start, end in hits:
+            if end <= last_end:
+                continue
+            match = self._hyperscan_confirmer.search(data, max(start, last_end))
+            if match is None:
+                break
+            spans.append((match.start(), match.end(), self._group_entities[match.lastindex]))
+            last_end = match.end()
+        return spans
+
+    def _bind_generators(self):
+        """
+        Binds the fake data generator's methods per entity type.
+
+        Returns:
+            dict: A dictionary mapping entity types to generator methods.
+        """
+        return {
+            "name": self.faker.name,
+            "address": self.faker.address,
+            "phone_number": self.faker.phone_number,
+        }
+
+    def _reset_replacements(self, seed=None):
+        """
+        Discards the replacements generated so far and restarts the built-in generator from a seed,
+        so that the replacements drawn next only depend on ``seed``.
+
+        Args:
+            seed (int or str, optional): Seed for the built-in generator. Defaults to None.
+        """
+        if isinstance(self.faker, _BuiltinFaker):
+            self.faker = _BuiltinFaker(seed)
+            self._generators = self._bind_generators()
+        self._replacement_pools = {}
+        self._draw_counts = {}
+        self._consistent_replacements = {}
+
+    def _get_replacement(self, entity_type, original=None):
+        """
+        Returns a UTF-8 encoded replacement for a given entity type.
+
+        Fake values come from a per-type pool that is filled on demand and reused once it holds
+        ``pool_size`` values, so the generator is only called a bounded number of times. In consistent mode,
+        the replacement is memoized per original text.
+
+        Args:
+            entity_type (str): The type of PII entity being replaced (e.g., "name", "address").
+            original (bytes, optional): The matched text, used as the memoization key in consistent mode.
+
+        Returns:
+            bytes: A fake replacement value for the entity.
+        """
+        if self.consistent and original is not None:
+            key = (entity_type, original)
+            replacement = self._consistent_replacements.get(key)
+            if replacement is None:
+                replacement = self._consistent_replacements[key] = self._draw_replacement(entity_type)
+            return replacement
+        return self._draw_replacement(entity_type)
+
+    def _draw_replacement(self, entity_type):
+        """
+        Draws the next replacement for a given entity type from its pool.
+
+        Args:
+            entity_type (str): The type of PII entity being replaced.
+
+        Returns:
+            bytes: A fake replacement value for the entity.
+        """
+        pool = self._replacement_pools.setdefault(entity_type, [])
+        count = self._draw_counts.get(entity_type, 0)
+        self._draw_counts[entity_type] = count + 1
+        if count < self.pool_size:
+            pool.append(self._generate_replacement(entity_type))
+        return pool[count % self.pool_size]
+
+    def _generate_replacement(self, entity_type):
         """
-        Returns a replacement string for a given entity type using Faker.
+        Generates a new replacement for a given entity type using the fake data generator.
 
         Args:
             entity_type (str): The type of PII entity being replaced (e.g., "name", "address").
 
         Returns:
-            str: A fake replacement value for the entity.
+            bytes: A UTF-8 encoded fake replacement value for the entity.
         """
+        generator = self._generators.get(entity_type)
+        if generator is None:
+            self.logger.warning(f"No replacement defined for entity type: {entity_type}. Returning empty string.")
+            return b""
         try:
-            if entity_type == "name":
-                return self.faker.name()
-            elif entity_type == "address":
-                return self.faker.address()
-            elif entity_type == "phone_number":
-                return self.faker.phone_number()
-            else:
-                self.logger.warning(f"No replacement defined for entity type: {entity_type}. Returning empty string.")
-                return ""
+            return generator().encode()
         except Exception as e:
             self.logger.exception(f"Error generating fake data for {entity_type}: {e}")
-            return "[REDACTED]"
+            return b"[REDACTED]"
+
+@functools.lru_cache(maxsize=32)
+def _compiled_redactor(pattern_items):
+    """
+    Returns the redactor whose compiled patterns are shared by get_redactor's redactors for the same patterns.
+
+    Args:
+        pattern_items (tuple): The patterns as a tuple of (entity type, regex) pairs, or None for the default patterns.
+
+    Returns:
+        PIIEntityRedactor: The cached redactor. Its replacement state is never used.
+
+    Raises:
+        TypeError: If a pattern is not a string.
+        ValueError: If a pattern is invalid or prone to catastrophic backtracking.
+    """
+    patterns = dict(pattern_items) if pattern_items is not None else None
+    if patterns is not None:
+        validate_patterns(patterns)
+    return PIIEntityRedactor(patterns=patterns)
+
+def get_redactor(pattern_items=None, consistent=False, seed=None):
+    """
+    Returns a new PIIEntityRedactor sharing the compiled patterns (combined regex, Hyperscan database
+    and prefilters) of earlier redactors with the same patterns, so repeated callers do not recompile them.
+    Replacement pools, draw counters, the consistent-mode memo and the patterns dictionary are the new redactor's own.
+
+    Args:
+        pattern_items (tuple, optional): The patterns as a tuple of (entity type, regex) pairs, e.g.
+            ``tuple(patterns.items())``. Order matters: earlier patterns win when matches start at the
+            same position. Defaults to None, which uses the default patterns.
+        consistent (bool, optional): Whether repeated mentions of the same entity get the same replacement. Defaults to False.
+        seed (int, optional): Seed for the built-in generator. Defaults to None.
+
+    Returns:
+        PIIEntityRedactor: A new redactor for these settings.
+
+    Raises:
+        TypeError: If a pattern is not a string.
+        ValueError: If a pattern is invalid or prone to catastrophic backtracking.
+    """
+    redactor = copy.copy(_compiled_redactor(pattern_items))
+    redactor.patterns = dict(redactor.patterns)
+    redactor.consistent = consistent
+    redactor.seed = seed
+    redactor._reset_replacements(seed)
+    return redactor
+
+def _create_faker():
+    """
+    Creates a Faker instance. Faker is imported here rather than at startup, since loading its providers is slow.
+
+    Returns:
+        Faker: A new Faker instance.
+    """
+    from faker import Faker
+    return Faker()
+
+# Redactor of the current worker process, created by _init_worker
+_worker_redactor = None
+
+def _init_worker(patterns, consistent, pool_size, use_scanner, use_faker, seed):
+    """
+    Creates the redactor used by a worker process.
+
+    Args:
+        patterns (dict): A dictionary of regex patterns for PII entities.
+        consistent (bool): Whether repeated mentions of the same entity get the same replacement.
+        pool_size (int): The number of fake values generated per entity type before they are reused.
+        use_scanner (bool): Whether to match the default patterns with the hand-written scanner.
+        use_faker (bool): Whether to generate fake data with the Faker library.
+        seed (int): Seed for the built-in generator.
+    """
+    global _worker_redactor
+    faker_instance = _create_faker() if use_faker else None
+    _worker_redactor = PIIEntityRedactor(patterns=patterns, faker_instance=faker_instance, consistent=consistent,
+                                         pool_size=pool_size, use_scanner=use_scanner, seed=seed)
+
+def _redact_in_worker(index, data):
+    """
+    Redacts a chunk of text in a worker process.
+
+    Args:
+        index (int): The index of the chunk in the stream.
+        data (bytes): The UTF-8 encoded text to redact.
+
+    Returns:
+        bytes: The redacted text.
+    """
+    if _worker_redactor.seed is not None:
+        # Chunks reach workers in no fixed order, so reseed per chunk for reproducible output
+        _worker_redactor._reset_replacements(f"{_worker_redactor.seed}:{index}")
+    return _worker_redactor.redact_text(data)
 
 def setup_argparse():
     """
@@ -95,10 +1102,297 @@ def setup_argparse():
     parser.add_argument("input_text", nargs="?", type=str, help="The input text to redact.  If not provided, reads from stdin.")
     parser.add_argument("-p", "--patterns", type=str, help="Path to a JSON file containing custom regex patterns.")
     parser.add_argument("-o", "--output", type=str, help="Path to the output file. If not provided, prints to stdout.")
+    parser.add_argument("-c", "--consistent", action="store_true", help="Replace repeated mentions of the same entity with the same fake value.")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of worker processes redacting piped input in parallel. 0 uses one per CPU. Defaults to 1.")
+    parser.add_argument("-f", "--faker", action="store_true", help="Generate fake data with the Faker library instead of the built-in generator.")
+    parser.add_argument("-s", "--seed", type=int, help="Seed for the built-in generator, for reproducible replacements. Parallel runs (--jobs above 1) seed each chunk separately, so their output differs from a single-process run.")
     parser.add_argument("-l", "--log_file", type=str, help="Path to the log file. If not provided, logs to console.")
 
     return parser
 
+def _child_sequences(op, av):
+    """
+    Returns the node sequences nested in a parsed regex node.
+
+    Args:
+        op: The node's opcode.
+        av: The node's argument.
+
+    Returns:
+        list: The nested sequences of (opcode, argument) nodes, empty for leaf nodes.
+    """
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, _POSSESSIVE_REPEAT):
+        return [av[2]]
+    if op == sre_parse.SUBPATTERN:
+        return [av[3]]
+    if op == _ATOMIC_GROUP:
+        return [av]
+    if op == sre_parse.BRANCH:
+        return av[1]
+    if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+        return [av[1]]
+    if op == sre_parse.GROUPREF_EXISTS:
+        return [child for child in av[1:] if child is not None]
+    return []
+
+def _iter_nodes(items):
+    """
+    Yields all nodes of a parsed regex sequence, including nested ones.
+
+    Args:
+        items: A sequence of (opcode, argument) nodes from sre_parse.
+
+    Yields:
+        tuple: The (opcode, argument) nodes.
+    """
+    for op, av in items:
+        yield op, av
+        for child in _child_sequences(op, av):
+            yield from _iter_nodes(child)
+
+def _is_nullable(items):
+    """
+    Checks whether a parsed regex sequence can match the empty string.
+
+    Args:
+        items: A sequence of (opcode, argument) nodes from sre_parse.
+
+    Returns:
+        bool: True if every node of the sequence can match the empty string.
+    """
+    for op, av in items:
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, _POSSESSIVE_REPEAT):
+            if av[0] > 0 and not _is_nullable(av[2]):
+                return False
+        elif op == sre_parse.SUBPATTERN:
+            if not _is_nullable(av[3]):
+                return False
+        elif op == _ATOMIC_GROUP:
+            if not _is_nullable(av):
+                return False
+        elif op == sre_parse.BRANCH:
+            if not any(_is_nullable(branch) for branch in av[1]):
+                return False
+        elif op not in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            return False
+    return True
+
+def _can_repeat(op, av):
+    """
+    Checks whether a parsed regex node can match a variable number of repetitions of something.
+
+    Args:
+        op: The node's opcode.
+        av: The node's argument.
+
+    Returns:
+        bool: True if the node is, or wraps, a backtracking quantifier with a variable count.
+    """
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+        return (av[0] != av[1] and av[1] > 1) or _is_ambiguous_body(av[2])
+    if op == sre_parse.SUBPATTERN:
+        return _is_ambiguous_body(av[3])
+    if op == sre_parse.BRANCH:
+        return any(_is_ambiguous_body(branch) for branch in av[1])
+    return False
+
+def _is_ambiguous_body(items):
+    """
+    Checks whether a sequence reduces to a single variable quantifier, i.e. all of its other nodes
+    can match the empty string, or contains an alternation whose alternatives overlap. Repeating such
+    a sequence lets the engine split the input between the inner and outer quantifiers, or between
+    the alternatives, in exponentially many ways.
+
+    Args:
+        items: A sequence of (opcode, argument) nodes from sre_parse.
+
+    Returns:
+        bool: True if the sequence is ambiguous under an outer quantifier.
+    """
+    # Each repetition is followed by the next one, so an alternative matching nothing overlaps with the body's start
+    if _has_overlapping_branch(items, _first_chars(items)[0]):
+        return True
+    for index, (op, av) in enumerate(items):
+        if _can_repeat(op, av) and _is_nullable(items[:index]) and _is_nullable(items[index + 1:]):
+            return True
+    return False
+
+def _class_chars(items):
+    """
+    Computes the characters matched by a parsed character class.
+
+    Args:
+        items: The (opcode, argument) items of an IN node from sre_parse.
+
+    Returns:
+        set: The matched character codes, or None if the class is negated or too large to list.
+    """
+    chars = set()
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            chars.add(av)
+        elif op == sre_parse.RANGE and av[1] - av[0] < 0x100:
+            chars.update(range(av[0], av[1] + 1))
+        elif op == sre_parse.CATEGORY and av in _CATEGORY_CHARS:
+            chars |= _CATEGORY_CHARS[av]
+        else:
+            return None
+    return chars
+
+def _first_chars(items):
+    """
+    Computes the characters a parsed regex sequence can start with.
+
+    Args:
+        items: A sequence of (opcode, argument) nodes from sre_parse.
+
+    Returns:
+        tuple: The set of possible first character codes (None if unknown, i.e. possibly any)
+        and whether the sequence can match the empty string.
+    """
+    chars = set()
+    for op, av in items:
+        nullable = False
+        if op == sre_parse.LITERAL:
+            node_chars = {av}
+        elif op == sre_parse.IN:
+            node_chars = _class_chars(av)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, _POSSESSIVE_REPEAT):
+            node_chars, nullable = _first_chars(av[2])
+            nullable = nullable or av[0] == 0
+        elif op in (sre_parse.SUBPATTERN, _ATOMIC_GROUP, sre_parse.BRANCH):
+            node_chars = set()
+            for child in _child_sequences(op, av):
+                child_chars, child_nullable = _first_chars(child)
+                node_chars = None if node_chars is None or child_chars is None else node_chars | child_chars
+                nullable = nullable or child_nullable
+        elif op in (sre_parse.AT, sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            continue
+        else:
+            node_chars = None
+        chars = None if chars is None or node_chars is None else chars | node_chars
+        if not nullable:
+            return chars, False
+    return chars, True
+
+def _union_chars(chars, other_chars):
+    """
+    Combines two sets of first characters, as returned by _first_chars.
+
+    Args:
+        chars (set): A set of character codes, or None if unknown.
+        other_chars (set): Another set of character codes, or None if unknown.
+
+    Returns:
+        set: The union of both sets, or None if either is unknown.
+    """
+    if chars is None or other_chars is None:
+        return None
+    return chars | other_chars
+
+def _has_overlapping_branch(items, follow):
+    """
+    Looks for alternations with two alternatives that can start with the same character, after any
+    leading nodes they share, or both match the empty string, such as ``(?:a|a)`` or ``(?:\\w+|\\d)``.
+    An alternative that can match the empty string starts with whatever follows the alternation,
+    so ``(a|aa)+``, parsed as ``a(?:|a)``, overlaps with its own next repetition.
+    Repeating such a sequence lets the engine match each repetition in several ways.
+
+    Args:
+        items: A sequence of (opcode, argument) nodes from sre_parse.
+        follow (set): The characters that can come right after the sequence, or None if unknown.
+
+    Returns:
+        bool: True if an overlapping alternation was found.
+    """
+    for index, (op, av) in enumerate(items):
+        rest_chars, rest_nullable = _first_chars(items[index + 1:])
+        node_follow = _union_chars(rest_chars, follow) if rest_nullable else rest_chars
+        if op == sre_parse.BRANCH and _branches_overlap(av[1], node_follow):
+            return True
+        for child in _child_sequences(op, av):
+            child_follow = node_follow
+            if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, _POSSESSIVE_REPEAT) and av[1] > 1:
+                child_follow = _union_chars(_first_chars(child)[0], node_follow)
+            if _has_overlapping_branch(child, child_follow):
+                return True
+    return False
+
+def _branches_overlap(branches, follow):
+    """
+    Checks whether two alternatives of an alternation can match at the same position.
+
+    Args:
+        branches: The alternatives, as sequences of (opcode, argument) nodes from sre_parse.
+        follow (set): The characters that can come right after the alternation, or None if unknown.
+
+    Returns:
+        bool: True if two alternatives overlap.
+    """
+    for index, branch in enumerate(branches):
+        for other in branches[:index]:
+            # Identical leading nodes, as in "\\d{3}-|\\d{3} ", match alike; compare what follows them
+            common = 0
+            while common < min(len(branch), len(other)) and repr(branch[common]) == repr(other[common]):
+                common += 1
+            chars, nullable = _first_chars(branch[common:])
+            other_chars, other_nullable = _first_chars(other[common:])
+            if nullable and other_nullable:
+                return True
+            if nullable:
+                chars = _union_chars(chars, follow)
+            if other_nullable:
+                other_chars = _union_chars(other_chars, follow)
+            if chars is None or other_chars is None:
+                if chars != set() and other_chars != set():
+                    return True
+            elif chars & other_chars:
+                return True
+    return False
+
+def _has_nested_quantifier(items):
+    """
+    Looks for unbounded quantifiers over ambiguous sequences, such as ``(a+)+``, ``(\\w+\\s?)*``
+    or ``(?:a|a)*``, which backtrack catastrophically on inputs that almost match.
+
+    This is a heuristic: it catches the common nested-quantifier forms, not every pattern with
+    exponential backtracking.
+
+    Args:
+        items: A sequence of (opcode, argument) nodes from sre_parse.
+
+    Returns:
+        bool: True if a nested quantifier was found.
+    """
+    for op, av in items:
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if av[1] == sre_parse.MAXREPEAT and _is_ambiguous_body(av[2]):
+                return True
+        if any(_has_nested_quantifier(child) for child in _child_sequences(op, av)):
+            return True
+    return False
+
+def validate_patterns(patterns):
+    """Validates custom regex patterns before they are compiled.
+
+    Args:
+        patterns (dict): A dictionary mapping entity types to regex patterns.
+
+    Raises:
+        TypeError: If a pattern is not a string.
+        ValueError: If a pattern is not a valid regular expression or contains a nested quantifier
+            or a repeated overlapping alternation that could backtrack catastrophically (ReDoS).
+    """
+    for entity_type, pattern in patterns.items():
+        if not isinstance(pattern, str):
+            raise TypeError(f"The pattern for {entity_type} must be a string.")
+        try:
+            tree = sre_parse.parse(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid regex for {entity_type}: {e}") from e
+        if _has_nested_quantifier(tree):
+            raise ValueError(f"The pattern for {entity_type} contains a nested quantifier or overlapping alternation prone to catastrophic backtracking: {pattern}")
+
 def load_patterns(file_path):
     """Loads regex patterns from a JSON file.
 
@@ -111,13 +1405,15 @@ def load_patterns(file_path):
     Raises:
         FileNotFoundError: If the file is not found.
         json.JSONDecodeError: If the file contains invalid JSON.
-        TypeError: If the loaded data is not a dictionary.
+        TypeError: If the loaded data is not a dictionary of strings.
+        ValueError: If a pattern is invalid or prone to catastrophic backtracking.
     """
     try:
         with open(file_path, 'r') as f:
             patterns = json.load(f)
             if not isinstance(patterns, dict):
                 raise TypeError("The JSON file must contain a dictionary of patterns.")
+            validate_patterns(patterns)
             return patterns
     except FileNotFoundError:
         logging.error(f"Pattern file not found: {file_path}")
@@ -128,6 +1424,9 @@ def load_patterns(file_path):
     except TypeError as e:
         logging.error(e)
         raise
+    except ValueError as e:
+        logging.error(e)
+        raise
     except Exception as e:
         logging.error(f"An unexpected error occurred while loading patterns: {e}")
         raise
@@ -154,35 +1453,38 @@ def main():
             patterns = load_patterns(args.patterns)
 
         # Initialize the PII entity redactor
-        redactor = PIIEntityRedactor(patterns=patterns)
+        faker_instance = _create_faker() if args.faker else None
+        redactor = PIIEntityRedactor(patterns=patterns, faker_instance=faker_instance, consistent=args.consistent, seed=args.seed)
 
-        # Read input text from stdin or from the argument
-        input_text = args.input_text
-        if not input_text:
-            if not sys.stdin.isatty(): # Check if input is coming from a pipe
-                input_text = sys.stdin.read()
-            else:
-                 parser.print_help()
-                 sys.exit(1)
+        jobs = args.jobs or os.cpu_count()
 
+        # Read input text from the argument, or stream it from stdin
+        input_text = args.input_text
+        if not input_text and sys.stdin.isatty(): # Stdin is only read when input is coming from a pipe
+            parser.print_help()
+            sys.exit(1)
 
-
-        # Redact the text
-        redacted_text = redactor.redact_text(input_text)
-
-        # Write the output to a file or stdout
-        if args.output:
-            try:
-                with open(args.output, "w") as f:
-                    f.write(redacted_text)
+        # Write the output to a file or stdout, as bytes through a large buffer
+        try:
+            if input_text:
+                redacted_text = redactor.redact_text(input_text.encode())
+                if args.output:
+                    with open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+                        f.write(redacted_text)
+                else:
+                    sys.stdout.buffer.write(redacted_text + b"\n") # Terminate the line like print() does
+                    sys.stdout.buffer.flush()
+            elif args.output:
+                with open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE) as f:
+                    redactor.redact_stream(sys.stdin.buffer, f, jobs=jobs)
+            else:
+                redactor.redact_stream(sys.stdin.buffer, sys.stdout.buffer, jobs=jobs)
+                sys.stdout.buffer.flush()
+            if args.output:
                 logging.info(f"Redacted text written to {args.output}")
-            except IOError as e:
-                logging.error(f"Error writing to output file: {e}")
-                sys.exit(1)
-
-
-        else:
-            print(redacted_text)
+        except IOError as e:
+            logging.error(f"Error writing output: {e}")
+            sys.exit(1)
     except FileNotFoundError as e:
         logging.error(e)
         sys.exit(1)
@@ -192,6 +1494,9 @@ def main():
     except TypeError as e:
         logging.error(e)
         sys.exit(1)
+    except ValueError as e:
+        logging.error(e)
+        sys.exit(1)
     except Exception as e:
         logging.exception("An unhandled error occurred.")
         sys.exit(1)